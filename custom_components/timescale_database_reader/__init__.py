@@ -13,16 +13,32 @@ Version: 1.0.0
 License: MIT
 """
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from .const import DOMAIN, CONF_TABLE, CONF_NAME
+from .const import (
+    DOMAIN,
+    CONF_TABLE,
+    CONF_NAME,
+    CONF_POOL_SIZE,
+    CONF_MAX_OVERFLOW,
+    CONF_EXECUTOR_WORKERS,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_MAX_OVERFLOW,
+    DEFAULT_EXECUTOR_WORKERS,
+    DEFAULT_MAX_POINTS,
+)
 from .db import TimescaleDBConnection
+from .encoding import ENCODINGS, FLOAT_DTYPES, COMPRESSIONS, compression_available, encode_rows
+from .resolution import choose_bucket
 from homeassistant.components import websocket_api
 from datetime import datetime
 import voluptuous as vol
+import asyncio
 import logging
 import re
 from datetime import timedelta
+from functools import partial
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -69,6 +85,32 @@ async def _fetch_table_columns(db: TimescaleDBConnection, table_ref: str) -> set
         _LOGGER.warning("Failed to fetch columns for %s: %s", table_ref, exc)
         return set()
 
+
+async def _fetch_bucket_width(db: TimescaleDBConnection, table_ref: str) -> int | None:
+    """
+    Return the bucket width in seconds if table_ref is a continuous aggregate.
+
+    Returns 0 for tables that are not a continuous aggregate and None if the
+    lookup failed.
+    """
+    schema, table = _split_table_ref(table_ref)
+    query = r"""
+        SELECT EXTRACT(EPOCH FROM CAST(
+            substring(view_definition from 'time_bucket\(''([^'']+)''') AS interval
+        )) AS seconds
+        FROM timescaledb_information.continuous_aggregates
+        WHERE view_schema = :schema
+          AND view_name = :table
+    """
+    try:
+        rows = await db.fetch(query, schema=schema, table=table)
+        if rows and rows[0].get("seconds"):
+            return int(rows[0]["seconds"])
+        return 0
+    except Exception as exc:
+        _LOGGER.warning("Failed to fetch bucket width for %s: %s", table_ref, exc)
+        return None
+
 # No platforms needed - using WebSocket API only
 
 
@@ -141,9 +183,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         port=db_conf["port"],
         user=db_conf["username"],
         password=db_conf["password"],
-        database=db_conf["database"]
+        database=db_conf["database"],
+        pool_size=db_conf.get(CONF_POOL_SIZE, DEFAULT_POOL_SIZE),
+        max_overflow=db_conf.get(CONF_MAX_OVERFLOW, DEFAULT_MAX_OVERFLOW),
+        executor_workers=db_conf.get(CONF_EXECUTOR_WORKERS, DEFAULT_EXECUTOR_WORKERS),
     )
     await db.connect()
+
+    async def _async_close_on_stop(event):
+        await db.close(cancel_pending=True)
+
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close_on_stop))
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = db
     hass.data[DOMAIN].setdefault("_entry_meta", {})[entry.entry_id] = {
         "database": db_conf.get("database"),
@@ -177,6 +227,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     hass.data[DOMAIN]["_coordinators"][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     # Register WebSocket API handler (only once per HA instance, not per config entry)
     if '_websocket_registered' not in hass.data[DOMAIN]:
@@ -221,6 +272,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             vol.Optional("downsample", default=0): int,
             vol.Optional("table"): str,
             vol.Optional("downsample_method"): vol.In(["avg", "last"]),
+            vol.Optional("encoding", default="json"): vol.In(ENCODINGS),
+            vol.Optional("float_dtype", default="float64"): vol.In(list(FLOAT_DTYPES)),
+            vol.Optional("compression", default="none"): vol.In(COMPRESSIONS),
+            vol.Optional("max_points"): vol.All(int, vol.Range(min=2)),
+            vol.Optional("resolution"): vol.In(["auto"]),
         })
         @websocket_api.async_response
         async def handle_timescale_query(hass, connection, msg):
@@ -239,9 +295,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                     - limit: Maximum rows to return (0 = no limit)
                     - downsample: Bucket size in seconds (0 = raw data)
                     - entry_id: Optional specific database connection
+                    - encoding: "json" (default) or "binary" (see encoding.py)
+                    - float_dtype: "float32" or "float64" for binary values
+                    - compression: "none", "zlib" or "zstd" for binary data
+                    - max_points: Target point count; picks the bucket size automatically
+                    - resolution: "auto" to pick the bucket size (max_points defaults to 1000)
+                      Both are rejected together with a non-zero downsample.
                     
             Returns:
-                JSON array of data points via WebSocket
+                JSON array of data points, or a binary payload dict, via WebSocket.
+                With automatic resolution: {"downsample": <bucket seconds>, "max_points": <n>, "data": <payload>}
             """
             try:
                 _LOGGER.warning(f"[WEBSOCKET] Received query: {msg}")
@@ -297,6 +360,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                 if limit < 0 or limit > MAX_LIMIT:
                     raise ValueError(f"Invalid limit: must be 0-{MAX_LIMIT}")
 
+                encoding = msg.get("encoding", "json")
+                float_dtype = msg.get("float_dtype", "float64")
+                compression = msg.get("compression", "none")
+                if encoding == "binary" and not compression_available(compression):
+                    raise ValueError(f"Compression not available: {compression}")
+
+                max_points = msg.get("max_points")
+                auto_resolution = msg.get("resolution") == "auto" or max_points is not None
+                if auto_resolution and int(msg.get("downsample", 0)):
+                    raise ValueError("downsample cannot be combined with max_points or resolution 'auto'")
+                if auto_resolution:
+                    max_points = int(max_points or DEFAULT_MAX_POINTS)
+                    if max_points > MAX_RETURN_ROWS:
+                        raise ValueError(f"Invalid max_points: must be 2-{MAX_RETURN_ROWS}")
+
+                async def _payload(rows, names, downsample):
+                    if encoding == "binary":
+                        # Packing and compressing up to MAX_RETURN_ROWS rows is too slow for the event loop;
+                        # use HA's executor so the entry's executor only runs database work
+                        data = await hass.async_add_executor_job(
+                            partial(encode_rows, rows, names, float_dtype=float_dtype, compression=compression)
+                        )
+                    else:
+                        data = rows
+                    if auto_resolution:
+                        return {"downsample": downsample, "max_points": max_points, "data": data}
+                    return data
+
                 entry_id, db, meta = _resolve_db_entry(msg)
                 if db is None:
                     raise ValueError("No database connection available")
@@ -333,6 +424,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                 has_value = "value" in columns
 
                 downsample = int(msg.get("downsample", 0))
+                if auto_resolution:
+                    if time_col == "minute":
+                        # Prefilled minute views
+                        granularity = 60
+                    elif time_col == "bucket":
+                        cache = hass.data[DOMAIN].setdefault("_table_bucket_cache", {})
+                        entry_cache = cache.setdefault(entry_id, {})
+                        granularity = entry_cache.get(table_ref)
+                        if granularity is None:
+                            granularity = await _fetch_bucket_width(db, table_ref)
+                            # Failed lookups are retried on the next query
+                            if granularity is not None:
+                                entry_cache[table_ref] = granularity
+                    else:
+                        granularity = None
+                    downsample = choose_bucket(duration, max_points, granularity)
                 downsample_method = str(msg.get("downsample_method") or "").lower()
                 if downsample_method not in {"avg", "last"}:
                     if requested_table and time_col in {"bucket", "minute"}:
@@ -369,7 +476,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                     _LOGGER.info(f"[WEBSOCKET] Downsampled query returned {len(rows) if isinstance(rows, list) else 'N/A'} rows")
                     if isinstance(rows, list) and len(rows) > MAX_RETURN_ROWS:
                         raise ValueError(f"Result too large: {len(rows)} rows exceeds max {MAX_RETURN_ROWS}")
-                    connection.send_message(websocket_api.result_message(msg["id"], rows))
+                    payload = await _payload(rows, ["bucket", "avg_state", "min_state", "max_state"], downsample)
+                    connection.send_message(websocket_api.result_message(msg["id"], payload))
                 else:
                     if has_value:
                         value_expr = "COALESCE(value, CASE WHEN state ~ '^-?\\d+(\\.\\d+)?$' THEN state::double precision END)"
@@ -392,9 +500,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
                             rows = rows[-int(limit):]
                         if len(rows) > MAX_RETURN_ROWS:
                             raise ValueError(f"Result too large: {len(rows)} rows exceeds max {MAX_RETURN_ROWS}")
-                    connection.send_message(websocket_api.result_message(msg["id"], rows))
+                    payload = await _payload(rows, ["time", "state"], downsample)
+                    connection.send_message(websocket_api.result_message(msg["id"], payload))
                     
                 _LOGGER.warning(f"[WEBSOCKET] Successfully sent response")
+            except asyncio.CancelledError:
+                # Queued query dropped because the entry is unloading or HA is stopping
+                _LOGGER.warning("[WEBSOCKET] Query cancelled: database connection closed")
+                connection.send_message(
+                    websocket_api.error_message(msg["id"], "query_cancelled", "Query cancelled: database connection closed")
+                )
+                if asyncio.current_task().cancelling():
+                    raise
             except Exception as e:
                 _LOGGER.error(f"[WEBSOCKET] FATAL ERROR: {e}", exc_info=True)
                 connection.send_message(websocket_api.error_message(msg["id"], "query_failed", str(e)))
@@ -423,6 +540,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     # WebSocket API only - no platform setup needed
     return True
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
+    """Reload the entry so changed options (pool sizes, connection) take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
     # Close database connection
@@ -435,5 +557,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     coordinators = hass.data.get(DOMAIN, {}).get("_coordinators", {})
     if isinstance(coordinators, dict):
         coordinators.pop(entry.entry_id, None)
+    bucket_cache = hass.data.get(DOMAIN, {}).get("_table_bucket_cache", {})
+    if isinstance(bucket_cache, dict):
+        bucket_cache.pop(entry.entry_id, None)
     await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     return True
@@ -3,7 +3,18 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_USERNAME, CONF_PASSWORD
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
-from .const import DOMAIN, CONF_TABLE, CONF_NAME
+from .const import (
+    DOMAIN,
+    CONF_TABLE,
+    CONF_NAME,
+    CONF_POOL_SIZE,
+    CONF_MAX_OVERFLOW,
+    CONF_EXECUTOR_WORKERS,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_MAX_OVERFLOW,
+    DEFAULT_EXECUTOR_WORKERS,
+    DB_CONNECT_TIMEOUT,
+)
 
 CONF_DATABASE = "database"
 
@@ -46,12 +57,13 @@ class TimescaleDatabaseReaderConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
                 await self._async_test_connection(user_input)
                 if entry is not None:
                     new_title = user_input.get(CONF_NAME, entry.title)
-                    self.hass.config_entries.async_update_entry(
+                    # A changed entry is reloaded by the update listener in __init__.py
+                    if not self.hass.config_entries.async_update_entry(
                         entry,
                         title=new_title,
                         data={**entry.data, **user_input},
-                    )
-                    await self.hass.config_entries.async_reload(entry.entry_id)
+                    ):
+                        await self.hass.config_entries.async_reload(entry.entry_id)
                     return self.async_abort(reason="reconfigure_successful")
                 title = user_input.get(CONF_NAME, "Timescale DB")
                 return self.async_create_entry(title=title, data=user_input)
@@ -84,8 +96,9 @@ class TimescaleDatabaseReaderConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
                 entry = self.hass.config_entries.async_get_entry(entry_id) if entry_id else None
                 if entry is not None:
                     new_title = user_input.get(CONF_NAME, entry.title)
-                    self.hass.config_entries.async_update_entry(entry, title=new_title, data=user_input)
-                    await self.hass.config_entries.async_reload(entry.entry_id)
+                    # A changed entry is reloaded by the update listener in __init__.py
+                    if not self.hass.config_entries.async_update_entry(entry, title=new_title, data=user_input):
+                        await self.hass.config_entries.async_reload(entry.entry_id)
                     return self.async_abort(reason="reauth_successful")
                 title = user_input.get(CONF_NAME, "Timescale DB")
                 return self.async_create_entry(title=title, data=user_input)
@@ -103,7 +116,7 @@ class TimescaleDatabaseReaderConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
                 f"postgresql+psycopg2://{data[CONF_USERNAME]}:{data[CONF_PASSWORD]}"
                 f"@{data[CONF_HOST]}:{data[CONF_PORT]}/{data[CONF_DATABASE]}"
             )
-            engine = create_engine(url, future=True)
+            engine = create_engine(url, future=True, connect_args={"connect_timeout": DB_CONNECT_TIMEOUT})
             try:
                 with engine.connect() as conn:
                     conn.execute(text("SELECT 1"))
@@ -126,9 +139,11 @@ class TimescaleDatabaseReaderOptionsFlowHandler(config_entries.OptionsFlow):
             try:
                 await self._async_test_connection(user_input)
                 new_title = user_input.get(CONF_NAME, self._config_entry.title)
+                # Store title and options in one update so the entry reloads once
                 self.hass.config_entries.async_update_entry(
                     self._config_entry,
                     title=new_title,
+                    options=user_input,
                 )
                 return self.async_create_entry(title="", data=user_input)
             except Exception:
@@ -143,6 +158,15 @@ class TimescaleDatabaseReaderOptionsFlowHandler(config_entries.OptionsFlow):
             vol.Required(CONF_PASSWORD, default=data.get(CONF_PASSWORD, "")): str,
             vol.Required(CONF_DATABASE, default=data.get(CONF_DATABASE, "")): str,
             vol.Required(CONF_TABLE, default=data.get(CONF_TABLE, "ltss")): str,
+            vol.Required(CONF_POOL_SIZE, default=data.get(CONF_POOL_SIZE, DEFAULT_POOL_SIZE)): vol.All(
+                int, vol.Range(min=1, max=50)
+            ),
+            vol.Required(CONF_MAX_OVERFLOW, default=data.get(CONF_MAX_OVERFLOW, DEFAULT_MAX_OVERFLOW)): vol.All(
+                int, vol.Range(min=0, max=50)
+            ),
+            vol.Required(CONF_EXECUTOR_WORKERS, default=data.get(CONF_EXECUTOR_WORKERS, DEFAULT_EXECUTOR_WORKERS)): vol.All(
+                int, vol.Range(min=0, max=100)
+            ),
         })
         return self.async_show_form(
             step_id="init",
@@ -156,7 +180,7 @@ class TimescaleDatabaseReaderOptionsFlowHandler(config_entries.OptionsFlow):
                 f"postgresql+psycopg2://{data[CONF_USERNAME]}:{data[CONF_PASSWORD]}"
                 f"@{data[CONF_HOST]}:{data[CONF_PORT]}/{data[CONF_DATABASE]}"
             )
-            engine = create_engine(url, future=True)
+            engine = create_engine(url, future=True, connect_args={"connect_timeout": DB_CONNECT_TIMEOUT})
             try:
                 with engine.connect() as conn:
                     conn.execute(text("SELECT 1"))
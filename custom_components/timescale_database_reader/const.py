@@ -3,6 +3,24 @@ DOMAIN = "timescale_database_reader"
 # Config keys
 CONF_NAME = "name"
 CONF_TABLE = "table"
+CONF_POOL_SIZE = "pool_size"
+CONF_MAX_OVERFLOW = "max_overflow"
+CONF_EXECUTOR_WORKERS = "executor_workers"
+
+# Connection pool defaults (executor_workers 0 = sized to pool_size + max_overflow)
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_EXECUTOR_WORKERS = 0
+
+# Database timeouts in seconds, so a dead host or slow query cannot stall unload or shutdown
+DB_CONNECT_TIMEOUT = 10
+DB_STATEMENT_TIMEOUT = 30
+DB_POOL_TIMEOUT = 10
+# Time unload gives queued and in-flight queries before cancelling them
+DB_CLOSE_TIMEOUT = 10
+
+# Target point count for resolution "auto" when no max_points is given
+DEFAULT_MAX_POINTS = 1000
 
 # Device info
 DEVICE_INFO = {
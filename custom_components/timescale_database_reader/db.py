@@ -1,45 +1,101 @@
 
-
 from sqlalchemy import create_engine, text
-import threading
+from homeassistant.util.executor import InterruptibleThreadPoolExecutor
+
+from .const import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_MAX_OVERFLOW,
+    DEFAULT_EXECUTOR_WORKERS,
+    DB_CONNECT_TIMEOUT,
+    DB_STATEMENT_TIMEOUT,
+    DB_POOL_TIMEOUT,
+    DB_CLOSE_TIMEOUT,
+)
 
 
 import logging
 _LOGGER = logging.getLogger(__name__)
 
 class TimescaleDBConnection:
-    def __init__(self, host, port, user, password, database):
+    def __init__(
+        self,
+        host,
+        port,
+        user,
+        password,
+        database,
+        pool_size=DEFAULT_POOL_SIZE,
+        max_overflow=DEFAULT_MAX_OVERFLOW,
+        executor_workers=DEFAULT_EXECUTOR_WORKERS,
+    ):
         self.host = host
         self.port = port
         self.user = user
         self.password = password
         self.database = database
+        self.pool_size = max(1, int(pool_size))
+        self.max_overflow = max(0, int(max_overflow))
+        # More workers than pooled connections would only queue on the pool checkout
+        pool_capacity = self.pool_size + self.max_overflow
+        executor_workers = int(executor_workers or 0)
+        self.executor_workers = min(executor_workers, pool_capacity) if executor_workers > 0 else pool_capacity
         self.engine = None
-        self.lock = threading.Lock()
+        self.executor = None
+        self._pending = set()
 
     async def connect(self):
-        # SQLAlchemy engine (sync, thread-safe)
+        # SQLAlchemy engine (sync, thread-safe); its QueuePool hands each worker its own connection
         url = f"postgresql+psycopg2://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
-        self.engine = create_engine(url, future=True)
+        self.engine = create_engine(
+            url,
+            future=True,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=DB_POOL_TIMEOUT,
+            connect_args={
+                "connect_timeout": DB_CONNECT_TIMEOUT,
+                "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT * 1000}",
+            },
+        )
+        # Dedicated executor per entry so slow queries do not starve HA's shared executor.
+        # On shutdown it joins its threads with a timeout and interrupts the rest.
+        self.executor = InterruptibleThreadPoolExecutor(
+            max_workers=self.executor_workers,
+            thread_name_prefix=f"timescale_{self.database}",
+        )
 
-    async def close(self):
+    async def close(self, cancel_pending=False):
+        import asyncio
+        if self.executor:
+            executor = self.executor
+            self.executor = None
+            if self._pending and not cancel_pending:
+                # Give queued and in-flight queries a bounded time to finish
+                await asyncio.wait(set(self._pending), timeout=DB_CLOSE_TIMEOUT)
+            # Cancels what is still queued, joins the workers up to a timeout and interrupts the rest
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, executor.shutdown)
         if self.engine:
             self.engine.dispose()
             self.engine = None
 
     async def fetch(self, query, **params):
         import asyncio
+        if self.executor is None:
+            raise RuntimeError("Database connection is not open")
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._fetch_sync, query, dict(params))
+        future = loop.run_in_executor(self.executor, self._fetch_sync, query, dict(params))
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return await future
 
     def _fetch_sync(self, query, params):
         # Debug: log params type en inhoud
         _LOGGER.debug(f"_fetch_sync params type: {type(params)}, value: {params}")
         if not isinstance(params, dict):
             params = dict(params)
-        with self.lock:
-            with self.engine.connect() as conn:
-                # Pass params via the parameters keyword argument
-                stmt = text(query)
-                result = conn.execute(stmt, parameters=params)
-                return [dict(row._mapping) for row in result]
+        with self.engine.connect() as conn:
+            # Pass params via the parameters keyword argument
+            stmt = text(query)
+            result = conn.execute(stmt, parameters=params)
+            return [dict(row._mapping) for row in result]
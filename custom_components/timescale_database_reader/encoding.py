@@ -0,0 +1,142 @@
+"""
+Binary transport encoding for WebSocket query results.
+
+Packs row dicts column-wise into little-endian typed arrays so the frontend
+can decode them straight into TypedArrays instead of parsing large JSON.
+
+Payload layout (version 1):
+
+    {
+        "encoding": "binary",
+        "version": 1,
+        "compression": "none" | "zlib" | "zstd",
+        "count": <number of rows>,
+        "fields": [
+            {"name": "time", "dtype": "int64", "unit": "ms", "delta": true, "data": "<base64>"},
+            {"name": "state", "dtype": "float64", "data": "<base64>"},
+            ...
+        ]
+    }
+
+Each field's ``data`` is base64 of the (optionally compressed) raw bytes of
+``count`` little-endian values. Time fields hold Unix epoch milliseconds,
+delta-encoded: the first value is absolute, every next value is the
+difference to the previous one. Missing float values are encoded as NaN.
+``fields`` always lists the query's columns, also when ``count`` is 0.
+"""
+from array import array
+from datetime import datetime, timezone
+import base64
+import sys
+import zlib
+
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as _zstd
+    except ImportError:
+        _zstd = None
+
+ENCODING_VERSION = 1
+ENCODINGS = ["json", "binary"]
+FLOAT_DTYPES = {"float32": "f", "float64": "d"}
+COMPRESSIONS = ["none", "zlib", "zstd"]
+
+_TIME_FIELDS = {"time", "bucket"}
+
+
+def compression_available(compression: str) -> bool:
+    """Return True if the given compression can be used in this environment."""
+    if compression == "zstd":
+        return _zstd is not None
+    return compression in COMPRESSIONS
+
+
+def _to_epoch_ms(value) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            # Query bounds are parsed as UTC, so naive timestamps are UTC too
+            value = value.replace(tzinfo=timezone.utc)
+        return int(round(value.timestamp() * 1000))
+    return int(round(float(value) * 1000))
+
+
+def _to_float(value) -> float:
+    if value is None:
+        return float("nan")
+    return float(value)
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "zlib":
+        return zlib.compress(data)
+    if compression == "zstd":
+        if _zstd is None:
+            raise ValueError("zstd compression is not available")
+        if hasattr(_zstd, "compress"):
+            return _zstd.compress(data)
+        return _zstd.ZstdCompressor().compress(data)
+    return data
+
+
+def _pack(values: array, compression: str) -> str:
+    if sys.byteorder != "little":
+        values.byteswap()
+    return base64.b64encode(_compress(values.tobytes(), compression)).decode("ascii")
+
+
+def encode_rows(
+    rows: list[dict],
+    names: list[str],
+    float_dtype: str = "float64",
+    compression: str = "none",
+) -> dict:
+    """
+    Encode query rows into the binary transport payload.
+
+    Args:
+        rows: Result rows; all rows share the same keys
+        names: Column names in output order, also emitted when rows is empty
+        float_dtype: "float32" or "float64" for value columns
+        compression: "none", "zlib" or "zstd"
+
+    Returns:
+        dict: Payload as described in the module docstring
+    """
+    if float_dtype not in FLOAT_DTYPES:
+        raise ValueError(f"Invalid float_dtype: {float_dtype}")
+    if not compression_available(compression):
+        raise ValueError(f"Compression not available: {compression}")
+
+    fields = []
+    for name in names:
+        if name in _TIME_FIELDS:
+            deltas = array("q")
+            previous = 0
+            for row in rows:
+                current = _to_epoch_ms(row[name])
+                deltas.append(current - previous)
+                previous = current
+            fields.append({
+                "name": name,
+                "dtype": "int64",
+                "unit": "ms",
+                "delta": True,
+                "data": _pack(deltas, compression),
+            })
+        else:
+            values = array(FLOAT_DTYPES[float_dtype], (_to_float(row[name]) for row in rows))
+            fields.append({
+                "name": name,
+                "dtype": float_dtype,
+                "data": _pack(values, compression),
+            })
+
+    return {
+        "encoding": "binary",
+        "version": ENCODING_VERSION,
+        "compression": compression,
+        "count": len(rows),
+        "fields": fields,
+    }
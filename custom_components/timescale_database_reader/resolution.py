@@ -0,0 +1,34 @@
+"""
+Automatic bucket selection for resolution "auto" queries.
+
+time_bucket aligns buckets to the epoch and the query range is inclusive on
+both ends, so a range of ``duration`` seconds can touch up to
+``duration / bucket + 1`` buckets. The chosen bucket reserves that extra one.
+"""
+import math
+
+# "Nice" bucket sizes in seconds
+NICE_BUCKETS = [
+    1, 2, 5, 10, 15, 30,
+    60, 120, 300, 600, 900, 1800,
+    3600, 7200, 10800, 21600, 43200,
+    86400, 172800, 604800, 1209600, 2592000,
+]
+
+
+def choose_bucket(duration: float, max_points: int, granularity: int | None = None) -> int:
+    """
+    Choose a bucket size (seconds) that keeps the result within max_points.
+
+    Returns the first nice size at or above the smallest fitting bucket. If the
+    source is a continuous aggregate with a known bucket width (granularity),
+    the bucket is a multiple of that width: the nice size when it is one,
+    otherwise the smallest fitting multiple of the width.
+    """
+    target = max(1, math.ceil(duration / max(max_points - 1, 1)))
+    step = int(granularity) if granularity and granularity > 0 else 1
+    aligned = step * math.ceil(target / step)
+    for candidate in NICE_BUCKETS:
+        if candidate >= aligned:
+            return candidate if candidate % step == 0 else aligned
+    return aligned
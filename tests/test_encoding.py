@@ -0,0 +1,114 @@
+"""Checks for the binary transport payload layout."""
+import base64
+import importlib.util
+import math
+import struct
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Load the module by path: importing the package would pull in Home Assistant
+_PATH = Path(__file__).parent.parent / "custom_components" / "timescale_database_reader" / "encoding.py"
+_SPEC = importlib.util.spec_from_file_location("encoding", _PATH)
+encoding = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(encoding)
+encode_rows = encoding.encode_rows
+
+BUCKET_FIELDS = ["bucket", "avg_state", "min_state", "max_state"]
+
+ROWS = [
+    {
+        "bucket": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        "avg_state": 1.5,
+        "min_state": None,
+        "max_state": 2.0,
+    },
+    {
+        "bucket": datetime(2026, 1, 1, 0, 1, tzinfo=timezone.utc),
+        "avg_state": -0.25,
+        "min_state": 1.0,
+        "max_state": 3.0,
+    },
+    {
+        "bucket": datetime(2026, 1, 1, 0, 3),  # naive, treated as UTC
+        "avg_state": 1e10,
+        "min_state": 0.0,
+        "max_state": None,
+    },
+]
+
+
+def _decode(payload, field):
+    data = base64.b64decode(field["data"])
+    if payload["compression"] == "zlib":
+        data = zlib.decompress(data)
+    code = {"int64": "q", "float32": "f", "float64": "d"}[field["dtype"]]
+    values = struct.unpack(f"<{payload['count']}{code}", data)
+    if field.get("delta"):
+        total, out = 0, []
+        for value in values:
+            total += value
+            out.append(total)
+        return out
+    return list(values)
+
+
+def _fields(payload):
+    return {field["name"]: field for field in payload["fields"]}
+
+
+def test_header_and_field_order():
+    payload = encode_rows(ROWS, BUCKET_FIELDS)
+    assert payload["encoding"] == "binary"
+    assert payload["version"] == 1
+    assert payload["compression"] == "none"
+    assert payload["count"] == 3
+    assert [field["name"] for field in payload["fields"]] == BUCKET_FIELDS
+
+
+def test_time_is_delta_encoded_little_endian_epoch_ms():
+    payload = encode_rows(ROWS, BUCKET_FIELDS)
+    field = _fields(payload)["bucket"]
+    assert field["dtype"] == "int64"
+    assert field["unit"] == "ms"
+    assert field["delta"] is True
+    start = 1767225600000
+    raw = base64.b64decode(field["data"])
+    assert struct.unpack("<3q", raw) == (start, 60000, 120000)
+    assert _decode(payload, field) == [start, start + 60000, start + 180000]
+
+
+def test_float64_values_and_nan_for_none():
+    payload = encode_rows(ROWS, BUCKET_FIELDS)
+    fields = _fields(payload)
+    assert len(base64.b64decode(fields["avg_state"]["data"])) == 3 * 8
+    assert _decode(payload, fields["avg_state"]) == [1.5, -0.25, 1e10]
+    min_state = _decode(payload, fields["min_state"])
+    assert math.isnan(min_state[0]) and min_state[1:] == [1.0, 0.0]
+    assert math.isnan(_decode(payload, fields["max_state"])[2])
+
+
+def test_float32_size():
+    payload = encode_rows(ROWS, BUCKET_FIELDS, float_dtype="float32")
+    field = _fields(payload)["avg_state"]
+    assert field["dtype"] == "float32"
+    assert len(base64.b64decode(field["data"])) == 3 * 4
+    assert _decode(payload, field) == [1.5, -0.25, struct.unpack("<f", struct.pack("<f", 1e10))[0]]
+
+
+def test_zlib_round_trip():
+    plain = encode_rows(ROWS, BUCKET_FIELDS)
+    packed = encode_rows(ROWS, BUCKET_FIELDS, compression="zlib")
+    assert packed["compression"] == "zlib"
+    for name in BUCKET_FIELDS:
+        plain_field = _fields(plain)[name]
+        packed_field = _fields(packed)[name]
+        assert zlib.decompress(base64.b64decode(packed_field["data"])) == base64.b64decode(plain_field["data"])
+
+
+def test_empty_result_keeps_fields():
+    payload = encode_rows([], ["time", "state"], compression="zlib")
+    assert payload["count"] == 0
+    assert [field["name"] for field in payload["fields"]] == ["time", "state"]
+    for field in payload["fields"]:
+        assert _decode(payload, field) == []
@@ -0,0 +1,55 @@
+"""Checks for automatic bucket selection (resolution "auto")."""
+import importlib.util
+import math
+from pathlib import Path
+
+# Load the module by path: importing the package would pull in Home Assistant
+_PATH = Path(__file__).parent.parent / "custom_components" / "timescale_database_reader" / "resolution.py"
+_SPEC = importlib.util.spec_from_file_location("resolution", _PATH)
+resolution = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(resolution)
+choose_bucket = resolution.choose_bucket
+
+HOUR = 3600
+DAY = 86400
+
+
+def _max_rows(duration, bucket):
+    """Worst-case epoch-aligned buckets touched by an inclusive range."""
+    return math.floor(duration / bucket) + 1
+
+
+def test_raw_table_uses_nice_sizes():
+    assert choose_bucket(HOUR, 1000) == 5
+    assert choose_bucket(365 * DAY, 1000) == 43200
+
+
+def test_minute_aggregate_aligns_to_width():
+    assert choose_bucket(HOUR, 1000, 60) == 60
+    assert choose_bucket(DAY, 1000, 60) == 120
+    assert choose_bucket(365 * DAY, 1000, 60) == 43200
+
+
+def test_width_without_nice_multiple_stays_close_to_target():
+    # 7-minute aggregate
+    assert choose_bucket(HOUR, 1000, 420) == 420
+    assert choose_bucket(DAY, 1000, 420) == 420
+    assert choose_bucket(30 * DAY, 1000, 420) == 2940
+    # 5-hour aggregate
+    assert choose_bucket(HOUR, 1000, 18000) == 18000
+    assert choose_bucket(DAY, 1000, 18000) == 18000
+    assert choose_bucket(365 * DAY, 1000, 18000) == 36000
+
+
+def test_result_stays_within_max_points():
+    for duration in (50000, HOUR, DAY, 7 * DAY, 365 * DAY):
+        for max_points in (2, 10, 999, 1000, 50000):
+            for granularity in (None, 60, 420, 18000):
+                bucket = choose_bucket(duration, max_points, granularity)
+                if granularity:
+                    assert bucket % granularity == 0
+                assert _max_rows(duration, bucket) <= max_points
+
+
+def test_exact_nice_target_reserves_alignment_bucket():
+    assert choose_bucket(50000, 50000) == 2